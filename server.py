@@ -2,16 +2,62 @@
 import asyncio
 import json
 import inspect
+import logging
 import websockets
-from datetime import datetime
 import threading
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import time
+from collections import deque
+from queue import Queue
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# orjson is ~3x faster to parse and returns bytes directly; fall back to stdlib json if missing
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+    _loads = json.loads
+
+# websockets >= 14 can send bytes as a text frame (send(data, text=True)), so the
+# orjson output goes out as-is; older releases need a str to produce a text frame.
+# It can also return text frames undecoded (recv(decode=False)): orjson validates
+# UTF-8 while parsing, so the library's own decode pass is redundant.
+try:
+    from websockets.asyncio.server import ServerConnection
+    _new_api = websockets.serve is websockets.asyncio.server.serve
+    SEND_BYTES_AS_TEXT = _new_api and "text" in inspect.signature(ServerConnection.send).parameters
+    RECV_RAW_BYTES = _new_api and "decode" in inspect.signature(ServerConnection.recv).parameters
+except ImportError:
+    SEND_BYTES_AS_TEXT = False
+    RECV_RAW_BYTES = False
+
+WS_MAX_MESSAGE_SIZE = 2**16  # game-state frames are a few hundred bytes
+
+# per-message/per-request logging goes through logger.debug with %-style args so it
+# costs nothing unless DEBUG is enabled
+logger = logging.getLogger(__name__)
+
+# uvloop is an optional drop-in replacement for the default asyncio event loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # ---------- Shared state ----------
-latest_ball_state = None
+# _latest_ball_bytes, paddle_state and score_state are copy-on-write: writers build a
+# fresh object and rebind the module global (atomic under the GIL), so readers can
+# take a reference without locking. The lock only serializes writers.
+# latest ball checkpoint record, kept only in encoded form: it is what GET /api/ball serves
+_latest_ball_bytes = None
 latest_ball_lock = threading.RLock()   # use RLock to be safe across threads
 
-checkpoint_history = []
+CHECKPOINT_HISTORY_SIZE = 50  # only the most recent checkpoints are ever served
+# records are kept as their encoded JSON bytes: far smaller than the dict graph, and
+# GET /api/checkpoints can splice them into the response without re-serializing
+checkpoint_history = deque(maxlen=CHECKPOINT_HISTORY_SIZE)
 total_checkpoints = 0
 
 # paddle_state: store simple canonical state for paddles (center y)
@@ -27,35 +73,84 @@ score_state = {
     "ai2": 0,
 }
 
-# connected websockets (maintained by the asyncio WS handler)
-connected_websockets = set()
+def _encode_scores(scores):
+    return _dumps({"ai1": int(scores.get("ai1", 0)), "ai2": int(scores.get("ai2", 0))})
+
+# GET /api/score body, re-encoded by the score writers so reads do no serialization
+_score_bytes = _encode_scores(score_state)
+
+# connected websockets -> outbound queue (maintained by the asyncio WS handler).
+# Each client has its own writer task draining its queue, so a slow client only
+# backs up its own queue instead of stalling broadcasts to everyone else.
+CLIENT_QUEUE_SIZE = 256
+connected_websockets = {}
+# tuple copy of connected_websockets.items(), rebuilt on connect/disconnect so
+# broadcasts don't have to copy the dict every time
+connected_snapshot = ()
+
+def _set_connected(websocket, queue=None):
+    """Register websocket with its outbound queue, or unregister it when queue is None."""
+    global connected_snapshot
+    if queue is not None:
+        connected_websockets[websocket] = queue
+    else:
+        connected_websockets.pop(websocket, None)
+    connected_snapshot = tuple(connected_websockets.items())
+
+# send a server_ack frame back for every WS message; off by default since clients
+# don't use it and it doubles outbound frames on the ingestion path
+ENABLE_ACK = False
 
 # reference to main asyncio loop (set in main)
 MAIN_LOOP = None
 
 def _now_ms():
-    return int(datetime.now().timestamp() * 1000)
+    return time.time_ns() // 1_000_000
+
+# ---------- Payload field extraction ----------
+# Alternative key paths accepted for each field, tried in order. Built once at import
+# so the per-message path just walks tuples instead of chaining .get(k, {}) lookups.
+WS_TS_PATHS = (("timestamp",), ("ts",))
+WS_BALL_PATHS = (("ball",), ("ballData",), ("gameState", "ball"))
+HTTP_TS_PATHS = (("checkpoint", "timestamp"), ("timestamp",))
+HTTP_BALL_PATHS = (("gameState", "ball"), ("ballState",), ("ball",))
+X_PATHS = (("x",), ("pos", "x"), ("position", "x"))
+Y_PATHS = (("y",), ("pos", "y"), ("position", "y"))
+VX_PATHS = (("velocityX",), ("velocity", "x"), ("vel", "x"))
+VY_PATHS = (("velocityY",), ("velocity", "y"), ("vel", "y"))
+LAST_HIT_PATHS = (("lastHit",), ("last_hit",))
+PADDLE1_PATHS = (("paddle1",), ("ai1Paddle",), ("paddleLeft",))
+PADDLE2_PATHS = (("paddle2",), ("ai2Paddle",), ("paddleRight",))
+
+def _first(d, paths):
+    """Return the first non-None value found along any of the key paths in d."""
+    for path in paths:
+        cur = d
+        for key in path:
+            cur = cur.get(key) if isinstance(cur, dict) else None
+            if cur is None:
+                break
+        if cur is not None:
+            return cur
+    return None
 
 def _normalize_record(source: dict):
-    ts = source.get("timestamp") or source.get("ts") or _now_ms()
-    ball = source.get("ball") or source.get("ballData") or source.get("gameState", {}).get("ball") or {}
+    ts = _first(source, WS_TS_PATHS) or _now_ms()
+    ball = _first(source, WS_BALL_PATHS) or {}
 
-    paddle1 = None
-    paddle2 = None
-    if "gameState" in source and isinstance(source["gameState"], dict):
-        gs = source["gameState"]
-        paddle1 = gs.get("paddle1") or gs.get("ai1Paddle") or gs.get("paddleLeft")
-        paddle2 = gs.get("paddle2") or gs.get("ai2Paddle") or gs.get("paddleRight")
+    gs = source.get("gameState")
+    paddle1 = _first(gs, PADDLE1_PATHS)
+    paddle2 = _first(gs, PADDLE2_PATHS)
 
     record = {
         "timestamp": int(ts),
-        "position_x": ball.get("x") or ball.get("pos", {}).get("x") or ball.get("position", {}).get("x"),
-        "position_y": ball.get("y") or ball.get("pos", {}).get("y") or ball.get("position", {}).get("y"),
-        "velocity_x": ball.get("velocityX") or ball.get("velocity", {}).get("x") or ball.get("vel", {}).get("x"),
-        "velocity_y": ball.get("velocityY") or ball.get("velocity", {}).get("y") or ball.get("vel", {}).get("y"),
+        "position_x": _first(ball, X_PATHS),
+        "position_y": _first(ball, Y_PATHS),
+        "velocity_x": _first(ball, VX_PATHS),
+        "velocity_y": _first(ball, VY_PATHS),
         "radius": ball.get("radius"),
         "speed": ball.get("speed"),
-        "lastHit": ball.get("lastHit") or ball.get("last_hit") or source.get("lastHit"),
+        "lastHit": _first(ball, LAST_HIT_PATHS) or source.get("lastHit"),
         "paddle1": paddle1,
         "paddle2": paddle2,
         "raw": source
@@ -64,42 +159,48 @@ def _normalize_record(source: dict):
 
 # ---------- WebSocket handler ----------
 async def my_handler(websocket, path=None):
-    global latest_ball_state, checkpoint_history, total_checkpoints, connected_websockets
+    global _latest_ball_bytes, checkpoint_history, total_checkpoints, connected_websockets
 
     peer = getattr(websocket, "remote_address", None)
     print(f"✅ WS Client connected: {peer}  path={path}")
-    connected_websockets.add(websocket)
+    queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+    writer = asyncio.create_task(_client_writer(websocket, queue))
+    _set_connected(websocket, queue)
 
     try:
-        async for message in websocket:
+        while True:
+            if RECV_RAW_BYTES:
+                message = await websocket.recv(decode=False)
+            else:
+                message = await websocket.recv()
             try:
-                data = json.loads(message)
+                data = _loads(message)
             except json.JSONDecodeError:
-                print("📥 Received non-JSON message (WS):")
-                print(message)
+                logger.debug("📥 Received non-JSON message (WS): %r", message)
                 continue
 
-            print("📥 Received JSON (WS):")
-            print(json.dumps(data, indent=2))
+            logger.debug("📥 Received JSON (WS): %s", message)
 
             handled_checkpoint = False
 
             # accept WS checkpoint types and also client gameState payloads
             if data.get("type") == "ball_checkpoint" or "gameState" in data:
                 record = _normalize_record(data)
+                record_bytes = _dumps(record)
                 with latest_ball_lock:
-                    latest_ball_state = record
-                    checkpoint_history.append(record)
+                    _latest_ball_bytes = record_bytes
+                    checkpoint_history.append(record_bytes)
                     total_checkpoints += 1
-                print(f"🔁 Updated shared latest_ball_state from WS (total_checkpoints={total_checkpoints})")
+                logger.debug("🔁 Updated latest ball state from WS (total_checkpoints=%d)", total_checkpoints)
                 handled_checkpoint = True
 
             # Optionally respond to client (ack)
+            if not ENABLE_ACK:
+                continue
             try:
-                if websocket.open:
-                    ack = {"type": "server_ack", "received_type": data.get("type"), "ts": _now_ms()}
-                    await websocket.send(json.dumps(ack))
-            except Exception:
+                ack = {"type": "server_ack", "received_type": data.get("type"), "ts": _now_ms()}
+                queue.put_nowait((None, _dumps(ack)))
+            except asyncio.QueueFull:
                 pass
 
     except websockets.ConnectionClosed:
@@ -107,31 +208,79 @@ async def my_handler(websocket, path=None):
     except Exception as e:
         print("⚠️ WS handler exception:", e)
     finally:
-        connected_websockets.discard(websocket)
+        _set_connected(websocket)
+        writer.cancel()
+
+# ---------- Broadcasting helpers ----------
+def _send_text(websocket, data: bytes):
+    # clients JSON.parse text frames, so the bytes are always sent as text
+    if SEND_BYTES_AS_TEXT:
+        return websocket.send(data, text=True)
+    return websocket.send(data.decode())
+
+async def _client_writer(websocket, queue):
+    """
+    Drain one client's outbound queue of (coalesce_key, bytes) items.
+    When several items are pending, only the newest one per coalesce_key is sent
+    (e.g. a backlog of score updates collapses to the latest score).
+    """
+    try:
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            if len(batch) > 1:
+                newest = {key: i for i, (key, _) in enumerate(batch) if key is not None}
+                batch = [item for i, item in enumerate(batch) if item[0] is None or newest[item[0]] == i]
+            for _, data in batch:
+                await _send_text(websocket, data)
+    except websockets.ConnectionClosed:
+        pass
+    except Exception as e:
+        print("⚠️ WS writer exception:", e)
+        await websocket.close()
 
-# ---------- Broadcasting helper ----------
-async def broadcast_message(payload: dict):
+# strong references to in-flight close() tasks for dropped clients, so they aren't
+# garbage-collected before finishing
+_closing_tasks = set()
+
+def _closing_done(task):
+    _closing_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print("⚠️ WS close failed:", task.exception())
+
+def _drop_slow_client(websocket):
+    _set_connected(websocket)
+    task = asyncio.ensure_future(websocket.close(1013, "client too slow"))
+    _closing_tasks.add(task)
+    task.add_done_callback(_closing_done)
+
+async def broadcast_bytes(data: bytes, coalesce_key=None):
     """
-    Send payload (dict) to all connected websockets.
+    Queue already-encoded JSON (bytes) for all connected websockets.
+    Callers encode with _dumps in their own thread so the event loop only does I/O.
+    Pending messages sharing a coalesce_key are collapsed to the newest one per client.
     This coroutine must be scheduled on the main event loop (use run_coroutine_threadsafe from other threads).
     """
-    if not connected_websockets:
-        return
-    text = json.dumps(payload)
-    stale = []
-    for ws in list(connected_websockets):
+    for ws, queue in connected_snapshot:
         try:
-            if ws.open:
-                await ws.send(text)
-            else:
-                stale.append(ws)
-        except Exception:
-            stale.append(ws)
-    for s in stale:
-        connected_websockets.discard(s)
+            queue.put_nowait((coalesce_key, data))
+        except asyncio.QueueFull:
+            # client can't keep up: disconnect it rather than buffer without bound
+            _drop_slow_client(ws)
 
 # ---------- HTTP server (stdlib) ----------
 class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
+    # drop idle connections (e.g. browser preconnects) instead of pinning a pool worker
+    timeout = 10
+
+    def log_request(self, code="-", size="-"):
+        # default implementation writes an access line to stderr for every request;
+        # log_error (malformed requests, send_error) still goes to stderr as usual
+        if isinstance(code, HTTPStatus):
+            code = code.value
+        logger.debug('%s - "%s" %s %s', self.address_string(), self.requestline, code, size)
+
     def _set_json_headers(self, status=200):
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
@@ -151,84 +300,82 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         # GET /api/ball -> return latest ball state
         if self.path.startswith("/api/ball"):
-            print(f"[HTTP] GET /api/ball received (thread={threading.current_thread().name})")
-            with latest_ball_lock:
-                if latest_ball_state is None:
-                    print("[HTTP] No latest_ball_state available -> returning 404")
-                    self._set_json_headers(404)
-                    self.wfile.write(json.dumps({"error": "no ball state available yet"}).encode())
-                    return
-                resp = json.loads(json.dumps(latest_ball_state))
+            logger.debug("[HTTP] GET /api/ball received (thread=%s)", threading.current_thread().name)
+            # writers rebind the already-encoded record, so there is nothing to copy or serialize
+            snapshot = _latest_ball_bytes
+            if snapshot is None:
+                logger.debug("[HTTP] No ball state available -> returning 404")
+                self._set_json_headers(404)
+                self.wfile.write(_dumps({"error": "no ball state available yet"}))
+                return
             self._set_json_headers(200)
-            self.wfile.write(json.dumps(resp).encode())
+            self.wfile.write(snapshot)
             return
 
         # GET /api/checkpoints -> return small history
         if self.path.startswith("/api/checkpoints"):
-            print(f"[HTTP] GET /api/checkpoints (thread={threading.current_thread().name})")
+            logger.debug("[HTTP] GET /api/checkpoints (thread=%s)", threading.current_thread().name)
             with latest_ball_lock:
-                items = list(checkpoint_history)[-50:]  # last 50
+                items = list(checkpoint_history)
             self._set_json_headers(200)
-            self.wfile.write(json.dumps({"count": len(items), "items": items}).encode())
+            self.wfile.write(b'{"count":%d,"items":[' % len(items) + b",".join(items) + b"]}")
             return
 
         # GET /api/paddles -> return current paddle state
         if self.path.startswith("/api/paddles"):
-            print(f"[HTTP] GET /api/paddles (thread={threading.current_thread().name})")
-            with latest_ball_lock:
-                resp = { "paddles": paddle_state.copy() }
+            logger.debug("[HTTP] GET /api/paddles (thread=%s)", threading.current_thread().name)
+            resp = { "paddles": paddle_state }
             self._set_json_headers(200)
-            self.wfile.write(json.dumps(resp).encode())
+            self.wfile.write(_dumps(resp))
             return
 
         # NEW: GET /api/score -> return current scores
         if self.path.startswith("/api/score"):
-            print(f"[HTTP] GET /api/score (thread={threading.current_thread().name})")
-            with latest_ball_lock:
-                resp = { "ai1": int(score_state.get("ai1", 0)), "ai2": int(score_state.get("ai2", 0)) }
+            logger.debug("[HTTP] GET /api/score (thread=%s)", threading.current_thread().name)
             self._set_json_headers(200)
-            self.wfile.write(json.dumps(resp).encode())
+            self.wfile.write(_score_bytes)
             return
 
         # Unknown GET
         self._set_json_headers(404)
-        self.wfile.write(json.dumps({"error": "not found"}).encode())
+        self.wfile.write(_dumps({"error": "not found"}))
 
     def do_POST(self):
-        global latest_ball_state, total_checkpoints, paddle_state, MAIN_LOOP, score_state
+        global _latest_ball_bytes, total_checkpoints, paddle_state, MAIN_LOOP, score_state, _score_bytes
 
         path = self.path or ""
         content_length = int(self.headers.get("Content-Length", 0))
         raw = self.rfile.read(content_length) if content_length else b""
         try:
-            payload = json.loads(raw.decode("utf-8")) if raw else {}
+            payload = _loads(raw) if raw else {}
         except Exception as e:
             self._set_json_headers(400)
-            self.wfile.write(json.dumps({"error": "invalid json", "detail": str(e)}).encode())
+            self.wfile.write(_dumps({"error": "invalid json", "detail": str(e)}))
             return
 
-        # POST /api/checkpoint-data or /api/ball-hit -> accept JSON payload and update latest_ball_state
+        # POST /api/checkpoint-data or /api/ball-hit -> accept JSON payload and update the latest ball state
         if path.startswith("/api/checkpoint-data") or path.startswith("/api/ball-hit"):
-            with latest_ball_lock:
-                ts = payload.get("checkpoint", {}).get("timestamp") or payload.get("timestamp") or _now_ms()
-                ball = payload.get("gameState", {}).get("ball") or payload.get("ballState") or payload.get("ball") or {}
-                game_ctx = payload.get("gameState") or payload.get("game") or {}
-
-                record = {
-                    "timestamp": int(ts),
-                    "position": {"x": ball.get("x") or ball.get("position", {}).get("x"), "y": ball.get("y") or ball.get("position", {}).get("y")},
-                    "velocity": {"x": ball.get("velocityX") or ball.get("velocity", {}).get("x"), "y": ball.get("velocityY") or ball.get("velocity", {}).get("y")},
-                    "speed": ball.get("speed"),
-                    "lastHit": ball.get("lastHit") or ball.get("last_hit"),
-                    "checkpoint": payload.get("checkpoint"),
-                    "raw_payload": payload,
-                    "gameContext": game_ctx
-                }
+            ts = _first(payload, HTTP_TS_PATHS) or _now_ms()
+            ball = _first(payload, HTTP_BALL_PATHS) or {}
+            game_ctx = payload.get("gameState") or payload.get("game") or {}
+
+            record = {
+                "timestamp": int(ts),
+                "position": {"x": _first(ball, X_PATHS), "y": _first(ball, Y_PATHS)},
+                "velocity": {"x": _first(ball, VX_PATHS), "y": _first(ball, VY_PATHS)},
+                "speed": ball.get("speed"),
+                "lastHit": _first(ball, LAST_HIT_PATHS),
+                "checkpoint": payload.get("checkpoint"),
+                "raw_payload": payload,
+                "gameContext": game_ctx
+            }
+            record_bytes = _dumps(record)
 
-                latest_ball_state = record
-                checkpoint_history.append(record)
+            with latest_ball_lock:
+                _latest_ball_bytes = record_bytes
+                checkpoint_history.append(record_bytes)
                 total_checkpoints += 1
-                print(f"[HTTP POST] Stored checkpoint (total_checkpoints={total_checkpoints})")
+                logger.debug("[HTTP POST] Stored checkpoint (total_checkpoints=%d)", total_checkpoints)
 
                 # If payload carries scores, update server-side score_state
                 # Accept shapes: {"scores":{"ai1":N,"ai2":M}} or {"score": {...}} or {"ai1Score":N,"ai2Score":M}
@@ -240,28 +387,34 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
                 if isinstance(scores, dict):
                     try:
                         # only update numeric values present
+                        new_scores = dict(score_state)
                         if scores.get("ai1") is not None:
-                            score_state["ai1"] = int(scores["ai1"])
+                            new_scores["ai1"] = int(scores["ai1"])
                         if scores.get("ai2") is not None:
-                            score_state["ai2"] = int(scores["ai2"])
-                        print(f"[HTTP POST] Updated score_state from payload -> {score_state}")
+                            new_scores["ai2"] = int(scores["ai2"])
+                        score_state = new_scores
+                        _score_bytes = _encode_scores(new_scores)
+                        logger.debug("[HTTP POST] Updated score_state from payload -> %s", score_state)
                     except Exception as e:
                         print("[HTTP POST] Failed to parse scores from payload:", e)
 
-            # Optionally broadcast this update to all WS clients
-            try:
-                if MAIN_LOOP:
-                    msg = {"type": "ball_checkpoint", "payload": record}
-                    asyncio.run_coroutine_threadsafe(broadcast_message(msg), MAIN_LOOP)
-                    # also broadcast score update if we changed it
-                    if isinstance(scores, dict):
-                        score_msg = {"type": "score_update", "scores": {"ai1": score_state["ai1"], "ai2": score_state["ai2"]}, "ts": _now_ms()}
-                        asyncio.run_coroutine_threadsafe(broadcast_message(score_msg), MAIN_LOOP)
-            except Exception as e:
-                print("[HTTP POST] Broadcast scheduling failed:", e)
+                # Optionally broadcast this update to all WS clients. Scheduled while still
+                # holding the lock: run_coroutine_threadsafe is FIFO, so concurrent POSTs
+                # broadcast in the same order they committed state.
+                try:
+                    if MAIN_LOOP:
+                        # splice the already-encoded record in rather than re-encoding it nested
+                        msg_bytes = b'{"type":"ball_checkpoint","payload":' + record_bytes + b"}"
+                        asyncio.run_coroutine_threadsafe(broadcast_bytes(msg_bytes), MAIN_LOOP)
+                        # also broadcast score update if we changed it
+                        if isinstance(scores, dict):
+                            score_bytes = _dumps({"type": "score_update", "scores": {"ai1": score_state["ai1"], "ai2": score_state["ai2"]}, "ts": _now_ms()})
+                            asyncio.run_coroutine_threadsafe(broadcast_bytes(score_bytes, "score_update"), MAIN_LOOP)
+                except Exception as e:
+                    print("[HTTP POST] Broadcast scheduling failed:", e)
 
             self._set_json_headers(200)
-            self.wfile.write(json.dumps({"ok": True, "stored_at": _now_ms()}).encode())
+            self.wfile.write(_dumps({"ok": True, "stored_at": _now_ms()}))
             return
 
         # POST /api/paddle-control -> control paddles (existing behavior)
@@ -270,14 +423,13 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
             action = payload.get("action")
             if paddle not in ("ai1", "ai2"):
                 self._set_json_headers(400)
-                self.wfile.write(json.dumps({"error": "invalid paddle; use 'ai1' or 'ai2'"}).encode())
+                self.wfile.write(_dumps({"error": "invalid paddle; use 'ai1' or 'ai2'"}))
                 return
 
             with latest_ball_lock:
                 cur_y = paddle_state.get(paddle, {}).get("y")
                 if cur_y is None:
                     cur_y = DEFAULT_PADDLE_CENTER
-                    paddle_state[paddle]["y"] = cur_y
 
                 if action == "set":
                     y = payload.get("y")
@@ -285,9 +437,9 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
                         y = float(y)
                     except Exception:
                         self._set_json_headers(400)
-                        self.wfile.write(json.dumps({"error": "invalid y value for set"}).encode())
+                        self.wfile.write(_dumps({"error": "invalid y value for set"}))
                         return
-                    paddle_state[paddle]["y"] = y
+                    new_y = y
 
                 elif action == "move":
                     dy = payload.get("dy")
@@ -295,34 +447,39 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
                         dy = float(dy)
                     except Exception:
                         self._set_json_headers(400)
-                        self.wfile.write(json.dumps({"error": "invalid dy value for move"}).encode())
+                        self.wfile.write(_dumps({"error": "invalid dy value for move"}))
                         return
-                    paddle_state[paddle]["y"] = cur_y + dy
+                    new_y = cur_y + dy
 
                 elif action == "home":
-                    paddle_state[paddle]["y"] = DEFAULT_PADDLE_CENTER
+                    new_y = DEFAULT_PADDLE_CENTER
 
                 else:
                     self._set_json_headers(400)
-                    self.wfile.write(json.dumps({"error": "invalid action; use 'set','move',or 'home'"}).encode())
+                    self.wfile.write(_dumps({"error": "invalid action; use 'set','move',or 'home'"}))
                     return
 
+                new_paddles = dict(paddle_state)
+                new_paddles[paddle] = {"y": new_y}
+                paddle_state = new_paddles
+
                 update = {
                     "type": "paddle_update",
                     "paddle": paddle,
-                    "y": paddle_state[paddle]["y"],
+                    "y": new_y,
                     "ts": _now_ms()
                 }
-                print(f"[HTTP POST] Paddle control applied: {update}")
+                logger.debug("[HTTP POST] Paddle control applied: %s", update)
 
-            try:
-                if MAIN_LOOP:
-                    asyncio.run_coroutine_threadsafe(broadcast_message(update), MAIN_LOOP)
-            except Exception as e:
-                print("[HTTP POST] Broadcast scheduling failed:", e)
+                # scheduled under the lock so broadcast order matches commit order
+                try:
+                    if MAIN_LOOP:
+                        asyncio.run_coroutine_threadsafe(broadcast_bytes(_dumps(update), "paddle_update:" + paddle), MAIN_LOOP)
+                except Exception as e:
+                    print("[HTTP POST] Broadcast scheduling failed:", e)
 
             self._set_json_headers(200)
-            self.wfile.write(json.dumps({"ok": True, "paddle": paddle, "y": paddle_state[paddle]["y"]}).encode())
+            self.wfile.write(_dumps({"ok": True, "paddle": paddle, "y": new_y}))
             return
 
         # NEW: POST /api/score -> set scores manually
@@ -332,44 +489,74 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
             ai2 = payload.get("ai2")
             with latest_ball_lock:
                 changed = False
+                new_scores = dict(score_state)
                 if ai1 is not None:
                     try:
-                        score_state["ai1"] = int(ai1)
+                        new_scores["ai1"] = int(ai1)
                         changed = True
                     except Exception:
                         self._set_json_headers(400)
-                        self.wfile.write(json.dumps({"error": "invalid ai1 value; must be integer"}).encode())
+                        self.wfile.write(_dumps({"error": "invalid ai1 value; must be integer"}))
                         return
                 if ai2 is not None:
                     try:
-                        score_state["ai2"] = int(ai2)
+                        new_scores["ai2"] = int(ai2)
                         changed = True
                     except Exception:
                         self._set_json_headers(400)
-                        self.wfile.write(json.dumps({"error": "invalid ai2 value; must be integer"}).encode())
+                        self.wfile.write(_dumps({"error": "invalid ai2 value; must be integer"}))
                         return
 
-                print(f"[HTTP POST] Manual score update: {score_state}")
+                score_state = new_scores
+                _score_bytes = _encode_scores(new_scores)
+                logger.debug("[HTTP POST] Manual score update: %s", score_state)
 
-            # broadcast score update to websockets, if any
-            try:
-                if MAIN_LOOP and changed:
-                    score_msg = {"type": "score_update", "scores": {"ai1": score_state["ai1"], "ai2": score_state["ai2"]}, "ts": _now_ms()}
-                    asyncio.run_coroutine_threadsafe(broadcast_message(score_msg), MAIN_LOOP)
-            except Exception as e:
-                print("[HTTP POST] Score broadcast scheduling failed:", e)
+                # broadcast score update to websockets, if any; scheduled under the lock
+                # so broadcast order matches commit order
+                try:
+                    if MAIN_LOOP and changed:
+                        score_bytes = _dumps({"type": "score_update", "scores": {"ai1": new_scores["ai1"], "ai2": new_scores["ai2"]}, "ts": _now_ms()})
+                        asyncio.run_coroutine_threadsafe(broadcast_bytes(score_bytes, "score_update"), MAIN_LOOP)
+                except Exception as e:
+                    print("[HTTP POST] Score broadcast scheduling failed:", e)
 
             self._set_json_headers(200)
-            self.wfile.write(json.dumps({"ok": True, "scores": score_state}).encode())
+            self.wfile.write(_dumps({"ok": True, "scores": new_scores}))
             return
 
         # Unknown POST
         self._set_json_headers(404)
-        self.wfile.write(json.dumps({"error": "not found"}).encode())
+        self.wfile.write(_dumps({"error": "not found"}))
+
+HTTP_MAX_WORKERS = 32  # caps handler threads (and their stacks) under bursty POST load
+HTTP_MAX_PENDING = 256  # accepted connections waiting for a free worker
+
+class PooledHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that runs requests on a fixed set of daemon worker threads."""
+    allow_reuse_address = True
+    request_queue_size = 256  # listen() backlog; the socketserver default is 5
+
+    def __init__(self, server_address, handler_class, max_workers=HTTP_MAX_WORKERS, max_pending=HTTP_MAX_PENDING):
+        self._pending = Queue(maxsize=max_pending)
+        super().__init__(server_address, handler_class)
+        # daemon threads, like ThreadingHTTPServer's, so they never block interpreter exit
+        for i in range(max_workers):
+            threading.Thread(target=self._worker, daemon=True, name=f"HTTPWorker-{i}").start()
+
+    def _worker(self):
+        while True:
+            request, client_address = self._pending.get()
+            self.process_request_thread(request, client_address)
+
+    def process_request(self, request, client_address):
+        # blocks the accept loop once the queue is full, so a burst waits in the
+        # kernel backlog instead of piling up accepted sockets in memory
+        self._pending.put((request, client_address))
 
 # ---------- Thread to run HTTP server ----------
 def run_http_server(host="0.0.0.0", port=3000):
-    server = HTTPServer((host, port), SimpleHTTPRequestHandler)
+    # pooled worker threads so a slow GET can't block checkpoint/score POSTs
+    server = PooledHTTPServer((host, port), SimpleHTTPRequestHandler)
     print(f"🌐 HTTP API server running at http://{host}:{port}")
     try:
         server.serve_forever()
@@ -378,13 +565,17 @@ def run_http_server(host="0.0.0.0", port=3000):
 
 # ---------- Adapter for handler signature compatibility ----------
 def make_adapter(user_handler):
-    sig = inspect.signature(user_handler)
-    params = len(sig.parameters)
-    async def adapter(websocket, path=None):
-        if params == 1:
+    # pick the call shape once here instead of branching on every connection
+    params = list(inspect.signature(user_handler).parameters.values())
+    if len(params) == 1:
+        async def adapter(websocket, path=None):
             await user_handler(websocket)
-        else:
-            await user_handler(websocket, path)
+        return adapter
+    if params[1].default is not inspect.Parameter.empty:
+        # already callable as handler(ws) or handler(ws, path): no wrapper frame needed
+        return user_handler
+    async def adapter(websocket, path=None):
+        await user_handler(websocket, path)
     return adapter
 
 # ---------- Main: start HTTP thread and run websocket server ----------
@@ -397,14 +588,20 @@ async def main(host="localhost", port=8765, http_host="0.0.0.0", http_port=3000)
     http_thread.start()
 
     adapter = make_adapter(my_handler)
-    async with websockets.serve(adapter, host, port):
+    # no permessage-deflate: it compresses every broadcast once per client, and the
+    # small JSON frames sent here gain little from it
+    async with websockets.serve(adapter, host, port, compression=None, max_size=WS_MAX_MESSAGE_SIZE):
         print(f"🚀 WebSocket server running at ws://{host}:{port}")
         print("📡 Accepting websocket messages and also serving HTTP API endpoints.")
         await asyncio.Future()  # run forever
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(message)s")
     try:
-        asyncio.run(main())
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
         print(f"📊 Total checkpoints received: {total_checkpoints}")